@@ -1,28 +1,61 @@
 import os
+import copy
 import json
+import asyncio
 import time
-import queue
 import urllib.parse
-import base64
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 import streamlit as st
 import streamlit.components.v1 as components
 import sounddevice as sd
+import numpy as np
 
+import torch
+from silero_vad import load_silero_vad
 from vosk import Model, KaldiRecognizer
-from transformers import pipeline
+from asr_server import RemoteRecognizer
+from transformers import AutoTokenizer, AutoModelForSequenceClassification
 
-import spotipy
-from spotipy.oauth2 import SpotifyOAuth
+try:
+    import onnxruntime
+    from optimum.onnxruntime import ORTModelForSequenceClassification, ORTOptimizer, ORTQuantizer
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig, OptimizationConfig
+except ImportError:
+    ORTModelForSequenceClassification = None
 
 # -----------------------------
 # 1. CONFIG & CONSTANTS
 # -----------------------------
-VOSK_MODEL_PATH = r"C:\Users\User\Attacca_Final\models\vosk-model-en-us-0.22"
-EMOTION_MODEL_NAME = "j-hartmann/emotion-english-distilroberta-base"
+VOSK_MODEL_PATH = r"C:\Users\User\Attacca_Final\models\vosk-model-small-en-us-0.15"
+# Optional word list for a grammar-constrained recognizer, e.g. ["happy", "sad", "angry", "[unk]"]; None = free dictation
+VOSK_GRAMMAR = None
+# "host:port" of a running asr_server.py; when set, Vosk decodes there and is never loaded in this process
+ASR_SERVER = os.environ.get("ATTACCA_ASR_SERVER")
+# Any sequence-classification checkpoint works, e.g. a MiniLM / XtremeDistil model fine-tuned on dair-ai/emotion
+EMOTION_MODEL_NAME = os.environ.get("ATTACCA_EMOTION_MODEL", "j-hartmann/emotion-english-distilroberta-base")
+# Fused + INT8 ONNX export of the emotion model, built on first run when optimum[onnxruntime] is installed
+EMOTION_ONNX_DIR = os.path.join("models", "emotion-onnx", EMOTION_MODEL_NAME.replace("/", "--"))
+EMOTION_ONNX_FILE = "model_optimized_quantized.onnx"
+# "server" classifies in this process; "browser" runs a quantized model client-side with Transformers.js
+EMOTION_BACKEND = os.environ.get("ATTACCA_EMOTION_BACKEND", "server")
+BROWSER_EMOTION_MODEL = "Xenova/distilroberta-base-emotion"
 
 SAMPLE_RATE = 16000
-BLOCKSIZE = 4000
+BLOCKSIZE = 8000
+# Partial transcripts are pushed to the browser at most 4x per second
+UI_REFRESH_SEC = 0.25
+PARTIAL_TPL = "<p style='text-align:center; color:white; font-style:italic;'>🧠 Belief System Updating: %s...</p>"
+CLASSIFY_INTERVAL_SEC = 0.5
+# Half the cores for emotion inference; the rest stay free for Kaldi decoding, the VAD and audio capture
+CLASSIFY_THREADS = max(1, (os.cpu_count() or 2) // 2)
+# Vosk decodes in 200 ms steps internally, so feed it in matching windows
+DECODE_CHUNK = 3200
+# Silero VAD: 512-sample (32 ms) windows; stop once speech has been heard and is followed by this much silence
+VAD_FRAME = 512
+VAD_THRESHOLD = 0.5
+VAD_SILENCE_MS = 800
 
 GENRE_OPTIONS = [
     "pop", "rock", "hip-hop", "r-n-b", "edm", "dance",
@@ -31,27 +64,33 @@ GENRE_OPTIONS = [
 ]
 
 EMOTION_TO_CHARACTER = {
-    "joy":      {"name": "Joy",      "emoji": "💛", "color": "#FEE033", "darker": "#998200", "text": "#ffffff", "image": r"C:\\Users\\User\\Attacca_Final\\images\\joy.png"},
-    "sadness":  {"name": "Sadness",  "emoji": "💙", "color": "#4A90E2", "darker": "#214a7a", "text": "#ffffff", "image": r"C:\\Users\\User\\Attacca_Final\\images\\sadness.png"},
-    "anger":    {"name": "Anger",    "emoji": "🔴", "color": "#E23E28", "darker": "#8b1a0d", "text": "#ffffff", "image": r"C:\\Users\\User\\Attacca_Final\\images\\anger.png"},
-    "fear":     {"name": "Fear",     "emoji": "🟣", "color": "#A386D5", "darker": "#5e438a", "text": "#ffffff", "image": r"C:\\Users\\User\\Attacca_Final\\images\\fear.png"},
-    "surprise": {"name": "Surprise", "emoji": "🩷", "color": "#FF4DD8", "darker": "#f71ccf", "text": "#ffffff", "image": r"C:\\Users\\User\\Attacca_Final\\images\\surprise.png"},
-    "disgust":  {"name": "Disgust",  "emoji": "💚", "color": "#76D672", "darker": "#3a6d38", "text": "#ffffff", "image": r"C:\\Users\\User\\Attacca_Final\\images\\disgust.png"},
-    "neutral":  {"name": "Ennui",    "emoji": "⚪", "color": "#808080", "darker": "#404040", "text": "#ffffff", "image": r"C:\\Users\\User\\Attacca_Final\\images\\neutral.png"}
+    "joy":      {"name": "Joy",      "emoji": "💛", "color": "#FEE033", "darker": "#998200", "text": "#ffffff", "image": "app/static/images/joy.png"},
+    "sadness":  {"name": "Sadness",  "emoji": "💙", "color": "#4A90E2", "darker": "#214a7a", "text": "#ffffff", "image": "app/static/images/sadness.png"},
+    "anger":    {"name": "Anger",    "emoji": "🔴", "color": "#E23E28", "darker": "#8b1a0d", "text": "#ffffff", "image": "app/static/images/anger.png"},
+    "fear":     {"name": "Fear",     "emoji": "🟣", "color": "#A386D5", "darker": "#5e438a", "text": "#ffffff", "image": "app/static/images/fear.png"},
+    "surprise": {"name": "Surprise", "emoji": "🩷", "color": "#FF4DD8", "darker": "#f71ccf", "text": "#ffffff", "image": "app/static/images/surprise.png"},
+    "disgust":  {"name": "Disgust",  "emoji": "💚", "color": "#76D672", "darker": "#3a6d38", "text": "#ffffff", "image": "app/static/images/disgust.png"},
+    "neutral":  {"name": "Ennui",    "emoji": "⚪", "color": "#808080", "darker": "#404040", "text": "#ffffff", "image": "app/static/images/neutral.png"}
+}
+
+# 6-class emotion datasets (dair-ai/emotion) use "love" where the console has no character
+EMOTION_LABEL_ALIASES = {"love": "joy"}
+
+# Per-character CSS is fixed, so format it once instead of on every RECORD click
+PRECOMPUTED_STYLE = {
+    mood: {
+        "bg_css": f"<style>.stApp {{ background-color: {c['color']} !important; }} .main-header, .sub-text, h3, h4, p {{ color: {c['text']} !important; }}</style>",
+        "box_style": f"background: linear-gradient(135deg, {c['darker']} 0%, #121212 100%); border: 2px solid {c['color']}; border-radius: 15px; padding: 20px; text-align: center; max-width: 800px; margin: 10px auto;",
+    }
+    for mood, c in EMOTION_TO_CHARACTER.items()
 }
 
 # -----------------------------
 # 2. HELPER FUNCTIONS
 # -----------------------------
-def get_local_img(file_path):
-    try:
-        if os.path.exists(file_path):
-            with open(file_path, "rb") as f:
-                data = base64.b64encode(f.read()).decode()
-            return f"data:image/png;base64,{data}"
-    except Exception as e:
-        print(f"Error: {e}")
-    return None
+def normalize_label(label):
+    label = label.lower()
+    return EMOTION_LABEL_ALIASES.get(label, label)
 
 @st.cache_resource
 def load_vosk():
@@ -60,35 +99,195 @@ def load_vosk():
         return None
     return Model(VOSK_MODEL_PATH)
 
+@st.cache_resource
+def load_vad():
+    # Process-wide template only; recordings use the per-session copy in st.session_state.vad
+    try:
+        # Weights ship inside the pinned silero-vad wheel: no network, same model on every install
+        return load_silero_vad()
+    except Exception as e:
+        print(f"Silero VAD unavailable, recording full duration: {e}")
+        return None
+
+def new_recognizer():
+    if ASR_SERVER:
+        return RemoteRecognizer(ASR_SERVER, SAMPLE_RATE, VOSK_GRAMMAR)
+    if VOSK_GRAMMAR:
+        return KaldiRecognizer(vosk_model, SAMPLE_RATE, json.dumps(VOSK_GRAMMAR))
+    return KaldiRecognizer(vosk_model, SAMPLE_RATE)
+
+def export_emotion_onnx():
+    model = ORTModelForSequenceClassification.from_pretrained(EMOTION_MODEL_NAME, export=True)
+    # optimization_level=99 is ORT_ENABLE_ALL: attention, LayerNorm and GELU fusions
+    ORTOptimizer.from_pretrained(model).optimize(OptimizationConfig(optimization_level=99), save_dir=EMOTION_ONNX_DIR)
+    quantizer = ORTQuantizer.from_pretrained(EMOTION_ONNX_DIR, file_name="model_optimized.onnx")
+    quantizer.quantize(AutoQuantizationConfig.avx2(is_static=False, per_channel=False), save_dir=EMOTION_ONNX_DIR)
+
+def emotion_device():
+    if torch.cuda.is_available():
+        return torch.device("cuda")
+    if torch.backends.mps.is_available():
+        return torch.device("mps")
+    return torch.device("cpu")
+
 @st.cache_resource
 def load_emotion_clf():
-    return pipeline("text-classification", model=EMOTION_MODEL_NAME, top_k=None)
+    torch.set_num_threads(CLASSIFY_THREADS)
+    tok = AutoTokenizer.from_pretrained(EMOTION_MODEL_NAME)
+    device = emotion_device()
+    if device.type != "cpu":
+        # FP16 on CUDA / Apple Silicon; the INT8 paths below are CPU-only
+        model = AutoModelForSequenceClassification.from_pretrained(EMOTION_MODEL_NAME, dtype=torch.float16).to(device)
+        model.eval()
+        return tok, model
+    if ORTModelForSequenceClassification is not None:
+        try:
+            if not os.path.exists(os.path.join(EMOTION_ONNX_DIR, EMOTION_ONNX_FILE)):
+                export_emotion_onnx()
+            options = onnxruntime.SessionOptions()
+            options.intra_op_num_threads = CLASSIFY_THREADS
+            return tok, ORTModelForSequenceClassification.from_pretrained(EMOTION_ONNX_DIR, file_name=EMOTION_ONNX_FILE, session_options=options)
+        except Exception as e:
+            print(f"ONNX Runtime emotion model unavailable, using PyTorch INT8: {e}")
+    model = AutoModelForSequenceClassification.from_pretrained(EMOTION_MODEL_NAME)
+    model.eval()
+    # INT8 weights for every Linear layer: ~4x less memory traffic per forward pass on CPU
+    model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    return tok, model
+
+@st.cache_resource
+def load_classify_executor():
+    # Single worker shared by all sessions: one forward pass at a time, and each session keeps at most one job queued
+    return ThreadPoolExecutor(max_workers=1)
 
-vosk_model = load_vosk()
-emotion_clf = load_emotion_clf()
+vosk_model = None if ASR_SERVER else load_vosk()
+vad_model = load_vad()
+if vad_model is None:
+    st.warning("Voice activity detection is unavailable, so every recording runs for the full duration.")
+if EMOTION_BACKEND not in ("server", "browser"):
+    st.error(f"Unknown ATTACCA_EMOTION_BACKEND '{EMOTION_BACKEND}': use 'server' or 'browser'.")
+    st.stop()
+if EMOTION_BACKEND == "server":
+    emotion_tok, emotion_model = load_emotion_clf()
+    # Label per output column, so a score row maps to a mood with one argmax
+    emotion_labels = np.array([normalize_label(emotion_model.config.id2label[i]) for i in range(emotion_model.config.num_labels)])
+    unknown_labels = set(emotion_labels) - EMOTION_TO_CHARACTER.keys()
+    if unknown_labels:
+        st.error(f"Emotion model labels have no character: {', '.join(sorted(unknown_labels))}")
+        st.stop()
+    classify_executor = load_classify_executor()
+else:
+    browser_emotion_clf = components.declare_component("browser_emotion_clf", path=os.path.join(os.path.dirname(os.path.abspath(__file__)), "frontend", "emotion_clf"))
 
-def record_and_transcribe(duration_sec):
-    q = queue.Queue()
-    rec = KaldiRecognizer(vosk_model, SAMPLE_RATE)
+# One recognizer per browser session, reset between recordings instead of rebuilt
+if (vosk_model or ASR_SERVER) and "rec" not in st.session_state:
+    try:
+        st.session_state.rec = new_recognizer()
+    except OSError as e:
+        st.error(f"ASR server at {ASR_SERVER} is unreachable: {e}")
+
+# Silero VAD keeps its RNN state on the module, so sessions recording at once each need their own copy
+if vad_model is not None and "vad" not in st.session_state:
+    st.session_state.vad = copy.deepcopy(vad_model)
+
+def classify_emotions(texts):
+    # One padded forward pass for the whole batch; returns a (len(texts), num_labels) float32 array aligned with emotion_labels
+    enc = emotion_tok(texts, padding=True, truncation=True, max_length=128, return_tensors="pt").to(emotion_model.device)
+    with torch.inference_mode():
+        return emotion_model(**enc).logits.softmax(-1).float().cpu().numpy()
+
+def decode_span(rec, audio, start, end):
+    # Feeds audio[start:end] to Vosk in DECODE_CHUNK windows; returns the finished segment texts
+    texts = []
+    for i in range(start, end, DECODE_CHUNK):
+        if rec.AcceptWaveform(audio[i:min(i + DECODE_CHUNK, end)].tobytes()):
+            text = json.loads(rec.Result())["text"]
+            if text: texts.append(text)
+    return texts
+
+def detect_speech(vad, audio, start, end):
+    # One speech/non-speech flag per VAD_FRAME window of audio[start:end]
+    samples = torch.from_numpy(audio[start:end].astype(np.float32) / 32768)
+    with torch.inference_mode():
+        return [vad(samples[i:i + VAD_FRAME], SAMPLE_RATE).item() > VAD_THRESHOLD for i in range(0, len(samples), VAD_FRAME)]
+
+async def record_and_transcribe(duration_sec, classify=True):
+    # Returns (transcript, scores); with classify=True the classifier runs on partial transcripts while recording
+    rec = st.session_state.rec
+    rec.Reset()
+    vad = st.session_state.get("vad")
+    if vad is not None: vad.reset_states()
+    needed = SAMPLE_RATE * duration_sec
+    # Preallocated for the whole recording: the audio callback only copies into it and signals
+    audio = np.empty(needed, dtype=np.int16)
+    written = [0]
+    ready = threading.Event()
     def callback(indata, frames, time_info, status):
-        q.put(bytes(indata))
+        n = min(frames, needed - written[0])
+        audio[written[0]:written[0] + n] = np.frombuffer(indata, dtype=np.int16, count=n)
+        written[0] += n
+        ready.set()
+        if written[0] >= needed:
+            raise sd.CallbackStop
     transcript_parts = []
     status_placeholder = st.empty()
+    shown_partial, partial, last_ui = "", "", 0.0
+    pending, pending_text, last_classify = None, "", 0.0
+    decoded = vad_pos = 0
+    speech_heard, silence_ms = False, 0
     with sd.RawInputStream(samplerate=SAMPLE_RATE, blocksize=BLOCKSIZE, dtype="int16", channels=1, callback=callback):
-        end_time = time.time() + duration_sec
-        while time.time() < end_time:
-            data = q.get()
-            if rec.AcceptWaveform(data):
-                res = json.loads(rec.Result())
-                if res['text']: transcript_parts.append(res['text'])
-            else:
-                partial = json.loads(rec.PartialResult()).get("partial", "")
-                if partial:
-                    status_placeholder.markdown(f"<p style='text-align:center; color:white; font-style:italic;'>🧠 Belief System Updating: {partial}...</p>", unsafe_allow_html=True)
+        while decoded < needed and not (speech_heard and silence_ms >= VAD_SILENCE_MS):
+            # Wait off the event loop so the pending classification and UI updates keep running
+            await asyncio.to_thread(ready.wait, UI_REFRESH_SEC)
+            ready.clear()
+            available = written[0]
+            decode_end = available if available == needed else decoded + (available - decoded) // DECODE_CHUNK * DECODE_CHUNK
+            vad_end = vad_pos + (available - vad_pos) // VAD_FRAME * VAD_FRAME if vad is not None else vad_pos
+            # Kaldi and the VAD both release the GIL, so decode and speech detection on the new audio run in parallel
+            jobs = {}
+            if decode_end > decoded:
+                jobs["texts"] = asyncio.to_thread(decode_span, rec, audio, decoded, decode_end)
+            if vad_end > vad_pos:
+                jobs["speech"] = asyncio.to_thread(detect_speech, vad, audio, vad_pos, vad_end)
+            results = dict(zip(jobs, await asyncio.gather(*jobs.values())))
+            texts, speech = results.get("texts", []), results.get("speech", [])
+            decoded, vad_pos = decode_end, vad_end
+            if texts:
+                transcript_parts.extend(texts)
+                partial = ""
+            for is_speech in speech:
+                if is_speech:
+                    speech_heard, silence_ms = True, 0
+                else:
+                    silence_ms += VAD_FRAME * 1000 // SAMPLE_RATE
+            now = time.time()
+            if now - last_ui >= UI_REFRESH_SEC:
+                last_ui = now
+                raw_partial = rec.PartialResult()
+                if raw_partial != shown_partial:
+                    shown_partial = raw_partial
+                    partial = json.loads(raw_partial).get("partial", "")
+                    if partial:
+                        status_placeholder.markdown(PARTIAL_TPL % partial, unsafe_allow_html=True)
+            if not classify or now - last_classify < CLASSIFY_INTERVAL_SEC:
+                continue
+            text = " ".join([*transcript_parts, partial]).strip()
+            if text and text != pending_text:
+                if pending: pending.cancel()
+                pending, pending_text, last_classify = classify_executor.submit(classify_emotions, [text]), text, now
+        # An early VAD stop can leave less than one DECODE_CHUNK undecoded
+        transcript_parts.extend(decode_span(rec, audio, decoded, written[0]))
     final = json.loads(rec.FinalResult()).get("text", "")
     if final: transcript_parts.append(final)
     status_placeholder.empty()
-    return " ".join(transcript_parts)
+    transcript = " ".join(transcript_parts)
+    if not transcript or not classify:
+        return transcript, None
+    # The last partial usually matches the final text, so its result is already (or nearly) done
+    if pending and pending_text == transcript:
+        return transcript, pending.result()[0]
+    if pending: pending.cancel()
+    return transcript, classify_executor.submit(classify_emotions, [transcript]).result()[0]
 
 # -----------------------------
 # 3. UI CONFIG
@@ -187,33 +386,58 @@ with st.sidebar:
 st.markdown("<h1 class='main-header'>Riley's Rhythms</h1>", unsafe_allow_html=True)
 st.markdown("<p class='sub-text'>Inside Out 2: Personal Memory Console</p>", unsafe_allow_html=True)
 
-if st.button("RECORD"):
-    transcript = record_and_transcribe(duration)
+def render_result(transcript, labels, probs):
+    best = int(probs.argmax())
+    mood = labels[best]
+    char, style = EMOTION_TO_CHARACTER[mood], PRECOMPUTED_STYLE[mood]
+    
+    st.markdown(style["bg_css"], unsafe_allow_html=True)
+
+    st.markdown(f"<div style='text-align:center;'><h3>“{transcript}”</h3></div>", unsafe_allow_html=True)
+    st.markdown(f"<img src='{char['image']}' class='character-img'>", unsafe_allow_html=True)
+
+    confidence = round(float(probs[best]) * 100)
+    st.markdown(f"<div style='max-width:600px; margin:auto; text-align:center; padding:15px; background:rgba(255,255,255,0.2); border-radius:15px; color:{char['text']}; border: 2px solid {char['text']};'>Core Memory Formed: {char['emoji']} <b>{char['name'].upper()}</b> ({confidence}% Energy)</div>", unsafe_allow_html=True)
+    st.divider()
+
+    # Rec Logic
+    media_type = "music" if platform == "Spotify" else "video"
+    rec_header = f"{char['name']} recommends this {media_type} to Riley"
+    box_style = style["box_style"]
+    
+    if platform == "Spotify":
+        st.markdown(f"<div style='{box_style}'><h4 style='color:{char['text']}; text-align:center;'>{rec_header}</h4><a href='https://open.spotify.com/search/{genre}%20{mood}' target='_blank' style='color:{char['color']};'>Open {char['name']}'s Playlist →</a></div>", unsafe_allow_html=True)
+    else:
+        search_query = urllib.parse.quote(f"{genre} {mood} music video")
+        st.markdown(f"<div style='{box_style}'><h3 style='color:{char['color']};'>{rec_header}</h3><a href='https://www.youtube.com/results?search_query={search_query}' target='_blank' style='color:{char['color']}; font-weight:bold;'>Explore on YouTube →</a></div>", unsafe_allow_html=True)
+
+if st.button("RECORD") and "rec" in st.session_state:
+    try:
+        transcript, scores = asyncio.run(record_and_transcribe(duration, classify=EMOTION_BACKEND == "server"))
+    except OSError as e:
+        if not ASR_SERVER: raise
+        # Drop the dead connection so the next run reconnects
+        del st.session_state.rec
+        st.error(f"Lost connection to the ASR server at {ASR_SERVER}: {e}")
+        transcript = ""
     if transcript:
-        scores = emotion_clf(transcript)[0]
-        best_emo = max(scores, key=lambda x: x['score'])
-        mood = best_emo['label']
-        char = EMOTION_TO_CHARACTER.get(mood, EMOTION_TO_CHARACTER["neutral"])
-        img_src = get_local_img(char['image'])
-        
-        st.markdown(f"<style>.stApp {{ background-color: {char['color']} !important; }} .main-header, .sub-text, h3, h4, p {{ color: {char['text']} !important; }}</style>", unsafe_allow_html=True)
-
-        st.markdown(f"<div style='text-align:center;'><h3>“{transcript}”</h3></div>", unsafe_allow_html=True)
-        if img_src: st.markdown(f'<img src="{img_src}" class="character-img">', unsafe_allow_html=True)
-
-        confidence = round(best_emo['score'] * 100)
-        st.markdown(f"<div style='max-width:600px; margin:auto; text-align:center; padding:15px; background:rgba(255,255,255,0.2); border-radius:15px; color:{char['text']}; border: 2px solid {char['text']};'>Core Memory Formed: {char['emoji']} <b>{char['name'].upper()}</b> ({confidence}% Energy)</div>", unsafe_allow_html=True)
-        st.divider()
-
-        # Rec Logic
-        media_type = "music" if platform == "Spotify" else "video"
-        rec_header = f"{char['name']} recommends this {media_type} to Riley"
-        box_style = f"background: linear-gradient(135deg, {char['darker']} 0%, #121212 100%); border: 2px solid {char['color']}; border-radius: 15px; padding: 20px; text-align: center; max-width: 800px; margin: 10px auto;"
-        
-        if platform == "Spotify":
-            st.markdown(f"<div style='{box_style}'><h4 style='color:{char['text']}; text-align:center;'>{rec_header}</h4><a href='https://open.spotify.com/search/{genre}%20{mood}' target='_blank' style='color:{char['color']};'>Open {char['name']}'s Playlist →</a></div>", unsafe_allow_html=True)
+        if EMOTION_BACKEND == "server":
+            render_result(transcript, emotion_labels, scores)
+        else:
+            st.session_state.browser_transcript = transcript
+
+# The browser component reruns the script once its result for the stored transcript is in
+if EMOTION_BACKEND != "server" and st.session_state.get("browser_transcript"):
+    transcript = st.session_state.browser_transcript
+    result = browser_emotion_clf(text=transcript, model=BROWSER_EMOTION_MODEL, key="browser_emotion_clf", default=None)
+    if result and result["text"] == transcript and result.get("error"):
+        st.error(f"Browser emotion model failed: {result['error']}")
+    elif result and result["text"] == transcript:
+        all_scores = [(normalize_label(s["label"]), s["score"]) for s in result["scores"]]
+        scores = [(label, score) for label, score in all_scores if label in EMOTION_TO_CHARACTER]
+        if not scores:
+            st.error(f"Browser emotion model labels have no character: {', '.join(sorted({label for label, _ in all_scores}))}")
         else:
-            search_query = urllib.parse.quote(f"{genre} {mood} music video")
-            st.markdown(f"<div style='{box_style}'><h3 style='color:{char['color']};'>{rec_header}</h3><a href='https://www.youtube.com/results?search_query={search_query}' target='_blank' style='color:{char['color']}; font-weight:bold;'>Explore on YouTube →</a></div>", unsafe_allow_html=True)
+            render_result(transcript, np.array([label for label, _ in scores]), np.array([score for _, score in scores], dtype=np.float32))
 
 st.markdown("<br><br><p style='text-align:center; opacity:0.6;'>Inside Out 2 Emotion Engine</p>", unsafe_allow_html=True)
\ No newline at end of file
@@ -0,0 +1,105 @@
+import json
+import socket
+import socketserver
+import struct
+import sys
+
+from vosk import Model, KaldiRecognizer
+
+# -----------------------------
+# Standalone Vosk process: loads the model once and serves every Streamlit worker.
+#   python asr_server.py <vosk-model-path> [port]
+#   ATTACCA_ASR_SERVER=127.0.0.1:2700 python -m streamlit run app.py
+# -----------------------------
+DEFAULT_PORT = 2700
+# Client-side limit for connecting and for each reply; a hung server surfaces as socket.timeout (an OSError)
+CLIENT_TIMEOUT_SEC = 5.0
+
+# Request: op byte + payload length; reply: payload length. Payloads follow the header.
+HEADER = struct.Struct("!cI")
+REPLY = struct.Struct("!I")
+
+def recv_exact(sock, n):
+    buf = bytearray()
+    while len(buf) < n:
+        chunk = sock.recv(n - len(buf))
+        if not chunk:
+            raise ConnectionError("ASR connection closed")
+        buf += chunk
+    return bytes(buf)
+
+class RemoteRecognizer:
+    # Same methods as KaldiRecognizer; decoding happens in the server process
+    def __init__(self, address, sample_rate, grammar=None, timeout=CLIENT_TIMEOUT_SEC):
+        host, port = address.rsplit(":", 1)
+        self.sock = socket.create_connection((host, int(port)), timeout=timeout)
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.call(b"I", json.dumps({"sample_rate": sample_rate, "grammar": grammar}).encode())
+
+    def call(self, op, payload=b""):
+        self.sock.sendall(HEADER.pack(op, len(payload)) + payload)
+        (n,) = REPLY.unpack(recv_exact(self.sock, REPLY.size))
+        return recv_exact(self.sock, n)
+
+    def AcceptWaveform(self, data):
+        return self.call(b"A", data) == b"1"
+
+    def Result(self):
+        return self.call(b"R").decode()
+
+    def PartialResult(self):
+        return self.call(b"P").decode()
+
+    def FinalResult(self):
+        return self.call(b"F").decode()
+
+    def Reset(self):
+        self.call(b"X")
+
+class RecognizerHandler(socketserver.BaseRequestHandler):
+    # One KaldiRecognizer per client connection, all sharing the server's Model
+    def handle(self):
+        rec = None
+        try:
+            while True:
+                op, n = HEADER.unpack(recv_exact(self.request, HEADER.size))
+                payload = recv_exact(self.request, n)
+                if op != b"I" and rec is None:
+                    # Protocol violation: nothing to decode with until the client sends its config
+                    return
+                reply = b""
+                if op == b"I":
+                    cfg = json.loads(payload)
+                    if cfg.get("grammar"):
+                        rec = KaldiRecognizer(self.server.model, cfg["sample_rate"], json.dumps(cfg["grammar"]))
+                    else:
+                        rec = KaldiRecognizer(self.server.model, cfg["sample_rate"])
+                elif op == b"A":
+                    reply = b"1" if rec.AcceptWaveform(payload) else b"0"
+                elif op == b"R":
+                    reply = rec.Result().encode()
+                elif op == b"P":
+                    reply = rec.PartialResult().encode()
+                elif op == b"F":
+                    reply = rec.FinalResult().encode()
+                elif op == b"X":
+                    rec.Reset()
+                else:
+                    return
+                self.request.sendall(REPLY.pack(len(reply)) + reply)
+        except ConnectionError:
+            # Client went away mid-request or mid-reply (reset, broken pipe); drop its recognizer
+            return
+
+class ASRServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        sys.exit("usage: python asr_server.py <vosk-model-path> [port]")
+    port = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_PORT
+    with ASRServer(("127.0.0.1", port), RecognizerHandler) as server:
+        server.model = Model(sys.argv[1])
+        print(f"Vosk ASR server listening on 127.0.0.1:{port}")
+        server.serve_forever()